@@ -103,26 +103,30 @@ def deduplex(dataset, this_var, dim1_short, dim2_short, preserve_order=True):
     dim1 = _get_check_dim(dim1_short, dataset)
     dim2 = _get_check_dim(dim2_short, dataset)
 
-    # Split multiplexed dimension into its components
+    # Split multiplexed dimension into its components. dim1 varies fastest along the duplexed
+    # dimension, so this is just a reshape of that axis into (dim2, dim1).
     n_dim1 = len(dataset[dim1])
-    da_out = (
-        da_in.rolling({dim_combined: n_dim1}, center=False)
-        .construct(dim1)
-        .isel({dim_combined: slice(n_dim1 - 1, None, n_dim1)})
-        .rename({dim_combined: dim2})
-        .assign_coords({dim1: dataset[dim1]})
-        .assign_coords({dim2: dataset[dim2]})
+    n_dim2 = len(dataset[dim2])
+    axis = da_in.get_axis_num(dim_combined)
+    new_shape = da_in.shape[:axis] + (n_dim2, n_dim1) + da_in.shape[axis + 1 :]
+    new_dims = da_in.dims[:axis] + (dim2, dim1) + da_in.dims[axis + 1 :]
+    new_coords = {k: v for k, v in da_in.coords.items() if dim_combined not in v.dims}
+    new_coords[dim1] = dataset[dim1]
+    new_coords[dim2] = dataset[dim2]
+    da_out = xr.DataArray(
+        da_in.data.reshape(new_shape),
+        dims=new_dims,
+        coords=new_coords,
+        attrs=da_in.attrs,
+        name=da_in.name,
     )
 
-    # Reorder so that the split dimensions are together and in the expected order
+    # Reorder so that the split dimensions are together and in the expected order, or else
+    # with dim1 moved to the end
     if preserve_order:
-        new_dim_order = []
-        for dim in da_out.dims:
-            if dim == dim2:
-                new_dim_order.append(dim1)
-            if dim != dim1:
-                new_dim_order.append(dim)
-        da_out = da_out.transpose(*new_dim_order)
+        da_out = da_out.transpose(*da_in.dims[:axis], dim1, dim2, *da_in.dims[axis + 1 :])
+    else:
+        da_out = da_out.transpose(..., dim1)
 
     return da_out
 
@@ -153,29 +157,44 @@ def scag_to_scls_by_age(scag_var, dataset):
     return deduplex(dataset, scag_var, "scls", "age", preserve_order=False)
 
 
+def _split_time_by_year(array):
+    """Reshape the time axis of monthly data into (year, month) axes
+
+    Probably only useful internally to this module; see monthly_to_annual(). Any incomplete
+    final year is dropped.
+
+    Args:
+        array (xarray DataArray): Monthly data with a "time" dimension
+
+    Returns:
+        tuple: The underlying data with the time axis split into (year, month); the position of
+               the year axis; and array at the last month of each year, for use as a template
+    """
+    axis = array.get_axis_num("time")
+    template = array.isel(time=slice(11, None, 12))
+    n_years = template.sizes["time"]
+    data = array.isel(time=slice(0, 12 * n_years)).data
+    data = data.reshape(data.shape[:axis] + (n_years, 12) + data.shape[axis + 1 :])
+    return data, axis, template
+
+
 def monthly_to_annual(array):
     """calculate annual mena from monthly data, using unequal month lengths fros noleap calendar.
     originally written by Keith Lindsay."""
-    mon_day = xr.DataArray(
-        np.array([31.0, 28.0, 31.0, 30.0, 31.0, 30.0, 31.0, 31.0, 30.0, 31.0, 30.0, 31.0]),
-        dims=["month"],
-    )
+    mon_day = np.array([31.0, 28.0, 31.0, 30.0, 31.0, 30.0, 31.0, 31.0, 30.0, 31.0, 30.0, 31.0])
     mon_wgt = mon_day / mon_day.sum()
-    return (
-        array.rolling(time=12, center=False)  # rolling
-        .construct("month")  # construct the array
-        .isel(
-            time=slice(11, None, 12)
-        )  # slice so that the first element is [1..12], second is [13..24]
-        .dot(mon_wgt, dims=["month"])
-    )
+    data, axis, template = _split_time_by_year(array)
+    return template.copy(data=np.tensordot(data, mon_wgt, axes=([axis + 1], [0])))
 
 
 def monthly_to_month_by_year(array):
     """go from monthly data to month x year data (for calculating climatologies, etc"""
-    return (
-        array.rolling(time=12, center=False)  # rolling
-        .construct("month")  # construct the array
-        .isel(time=slice(11, None, 12))
-        .rename({"time": "year"})
+    data, axis, template = _split_time_by_year(array)
+    template = template.rename({"time": "year"})
+    return xr.DataArray(
+        np.moveaxis(data, axis + 1, -1),
+        dims=template.dims + ("month",),
+        coords=template.coords,
+        attrs=template.attrs,
+        name=template.name,
     )
@@ -326,6 +326,12 @@ def define_pftlist():
     return pftlist
 
 
+# define_pftlist() as an array, built once, for converting integer vegetation types to names.
+# Read-only, since it's shared; copy it before using it as data in a Dataset.
+PFTLIST = np.array(define_pftlist())
+PFTLIST.setflags(write=False)
+
+
 # Get CLM ivt number corresponding to a given name
 def ivt_str2int(ivt_str):
     pftlist = define_pftlist()
@@ -435,6 +441,18 @@ def is_each_vegtype(this_vegtypelist, this_filter, this_method):
     if isinstance(this_vegtypelist, xr.DataArray):
         this_vegtypelist = this_vegtypelist.values
 
+    # Substring comparisons of vegetation type names can be done on the whole list at once
+    if this_method in ["ok_contains", "notok_contains"] and np.iterable(this_filter):
+        vegtype_array = np.asarray(this_vegtypelist)
+        if vegtype_array.ndim == 1 and vegtype_array.size and isinstance(vegtype_array[0], str):
+            vegtype_array = vegtype_array.astype(str)
+            is_match = np.zeros(vegtype_array.shape, dtype=bool)
+            for n in this_filter:
+                is_match |= np.char.find(vegtype_array, n) >= 0
+            if this_method == "notok_contains":
+                is_match = ~is_match
+            return is_match.tolist()
+
     return [is_this_vegtype(x, this_filter, this_method) for x in this_vegtypelist]
 
 
@@ -553,11 +571,15 @@ def lon_pm2idl(lons_in, fail_silently=False):
     return lons_out
 
 
+# Substrings of the names of vegetation types that are not managed crops. Shared by
+# define_mgdcrop_list() and trim_da_to_mgd_crop().
+NOTCROP_LIST = ["tree", "grass", "shrub", "unmanaged", "not_vegetated"]
+
+
 # List (strings) of managed crops in CLM.
 def define_mgdcrop_list():
-    notcrop_list = ["tree", "grass", "shrub", "unmanaged", "not_vegetated"]
     defined_pftlist = define_pftlist()
-    is_crop = is_each_vegtype(defined_pftlist, notcrop_list, "notok_contains")
+    is_crop = is_each_vegtype(defined_pftlist, NOTCROP_LIST, "notok_contains")
     return [defined_pftlist[i] for i, x in enumerate(is_crop) if x]
 
 
@@ -630,7 +652,7 @@ def xr_flexsel(xr_object, patches1d_itype_veg=None, warn_about_seltype_interp=Tr
                     patches1d_itype_veg = xr_object.patches1d_itype_veg.values
                 elif isinstance(patches1d_itype_veg, xr.core.dataarray.DataArray):
                     patches1d_itype_veg = patches1d_itype_veg.values
-                is_vegtype = is_each_vegtype(patches1d_itype_veg, selection, "ok_exact")
+                is_vegtype = np.isin(patches1d_itype_veg, selection)
             elif isinstance(selection[0], bool):
                 if len(selection) != len(xr_object.patch):
                     raise ValueError(
@@ -641,10 +663,10 @@ def xr_flexsel(xr_object, patches1d_itype_veg=None, warn_about_seltype_interp=Tr
                 is_vegtype = selection
             else:
                 raise TypeError(f"Not sure how to handle 'vegtype' of type {type(selection[0])}")
-            xr_object = xr_object.isel(patch=[i for i, x in enumerate(is_vegtype) if x])
+            xr_object = xr_object.isel(patch=np.flatnonzero(is_vegtype))
             if "ivt" in xr_object:
                 xr_object = xr_object.isel(
-                    ivt=is_each_vegtype(xr_object.ivt.values, selection, "ok_exact")
+                    ivt=np.flatnonzero(np.isin(xr_object.ivt.values, selection))
                 )
 
         else:
@@ -730,6 +752,7 @@ def xr_flexsel(xr_object, patches1d_itype_veg=None, warn_about_seltype_interp=Tr
                         inclCoords = selection
                 else:
                     raise TypeError(f"selection_type {selection_type} not recognized")
+                inclCoords = np.atleast_1d(inclCoords)
                 if key == "lat":
                     thisXY = "jxy"
                 elif key == "lon":
@@ -753,14 +776,19 @@ def xr_flexsel(xr_object, patches1d_itype_veg=None, warn_about_seltype_interp=Tr
                         xr_object[thisVar].values.astype(int) - 1
                     ]
                     # print(f"{thisVar_dim} size before: {xr_object.sizes[thisVar_dim]}")
-                    ok_ind = []
-                    new_1d_thisXY = []
-                    for i, x in enumerate(thisVar_coords):
-                        if x in inclCoords:
-                            ok_ind = ok_ind + [i]
-                            new_1d_thisXY = new_1d_thisXY + [(inclCoords == x).nonzero()[0] + 1]
+                    # Find included elements, and their new 1-based indices on inclCoords, all at
+                    # once rather than element by element
+                    ok_ind = np.flatnonzero(np.isin(thisVar_coords, inclCoords))
+                    inclCoords_order = np.argsort(inclCoords)
+                    new_1d_thisXY = (
+                        inclCoords_order[
+                            np.searchsorted(
+                                inclCoords, thisVar_coords[ok_ind], sorter=inclCoords_order
+                            )
+                        ]
+                        + 1
+                    )
                     xr_object = xr_object.isel({thisVar_dim: ok_ind})
-                    new_1d_thisXY = np.array(new_1d_thisXY).squeeze()
                     xr_object[thisVar].values = new_1d_thisXY
                     # print(f"{thisVar_dim} size after: {xr_object.sizes[thisVar_dim]}")
 
@@ -787,11 +815,19 @@ def xr_flexsel(xr_object, patches1d_itype_veg=None, warn_about_seltype_interp=Tr
 # Get PFT of each patch, in both integer and string forms.
 def get_patch_ivts(this_ds, this_pftlist):
     # First, get all the integer values; should be time*pft or pft*time. We will eventually just take the first timestep.
-    vegtype_int = this_ds.patches1d_itype_veg
-    vegtype_int.values = vegtype_int.values.astype(int)
+    # Converted as a new int32 DataArray, rather than by overwriting the values in this_ds.
+    vegtype_int = this_ds.patches1d_itype_veg.astype(np.int32, copy=False)
+
+    # Make sure no patch changes vegetation type over time. Comparing min and max along time
+    # avoids allocating a full time*patch boolean array.
+    if "time" in vegtype_int.dims:
+        time_axis = vegtype_int.get_axis_num("time")
+        vt = vegtype_int.values
+        if np.any(vt.max(axis=time_axis) != vt.min(axis=time_axis)):
+            raise ValueError("Some veg type changes over time")
 
     # Convert to strings.
-    vegtype_str = list(np.array(this_pftlist)[vegtype_int.values])
+    vegtype_str = np.asarray(this_pftlist)[vegtype_int.values]
 
     # Return a dictionary with both results
     return {"int": vegtype_int, "str": vegtype_str, "all_str": this_pftlist}
@@ -850,23 +886,23 @@ def mfdataset_preproc(ds, vars_to_import, vegtypes_to_import, timeSlice):
                 bounds_vars = bounds_vars + [bounds_var]
         vars_to_import = vars_to_import + bounds_vars
 
-        # Get list of variables to drop
-        varlist = list(ds.variables)
-        vars_to_drop = list(np.setdiff1d(varlist, vars_to_import))
-
-        # Drop them
-        ds = ds.drop_vars(vars_to_drop)
+        # Keep only those variables, in their original order
+        vars_to_import = set(vars_to_import)
+        ds = ds[[v for v in ds.variables if v in vars_to_import]]
 
     # Add vegetation type info
     if "patches1d_itype_veg" in list(ds):
-        this_pftlist = define_pftlist()
-        get_patch_ivts(
+        this_pftlist = PFTLIST.copy()
+        ivts = get_patch_ivts(
             ds, this_pftlist
         )  # Includes check of whether vegtype changes over time anywhere
+        ds["patches1d_itype_veg"] = ivts["int"]
         vegtype_da = get_vegtype_str_da(this_pftlist)
-        patches1d_itype_veg_str = vegtype_da.values[
-            ds.isel(time=0).patches1d_itype_veg.values.astype(int)
-        ]
+        patches1d_itype_veg_str = ivts["str"]
+        if "time" in ivts["int"].dims:
+            patches1d_itype_veg_str = np.take(
+                patches1d_itype_veg_str, 0, axis=ivts["int"].get_axis_num("time")
+            )
         npatch = len(patches1d_itype_veg_str)
         patches1d_itype_veg_str = xr.DataArray(
             patches1d_itype_veg_str,
@@ -884,21 +920,16 @@ def mfdataset_preproc(ds, vars_to_import, vegtypes_to_import, timeSlice):
     if timeSlice:
         ds = safer_timeslice(ds, timeSlice)
 
-    # Finish import
-    ds = xr.decode_cf(ds, decode_times=True)
-
     # Compute derived variables
     for v in derived_vars:
         if v == "HYEARS" and "HDATES" in ds and ds.HDATES.dims == ("time", "mxharvests", "patch"):
-            yearList = np.array([np.float32(x.year - 1) for x in ds.time.values])
-            hyears = ds["HDATES"].copy()
-            hyears.values = np.tile(
-                np.expand_dims(yearList, (1, 2)), (1, ds.dims["mxharvests"], ds.dims["patch"])
-            )
+            yearList = (ds.time.dt.year.values - 1).astype(np.float32)
+            # Harvest year is the previous year, except where HDATES is <= 0 or NaN: keep those
+            # values. One np.where() with yearList broadcast, instead of tiling and patching.
+            hdates = ds["HDATES"].values
             with np.errstate(invalid="ignore"):
-                is_le_zero = ~np.isnan(ds.HDATES.values) & (ds.HDATES.values <= 0)
-            hyears.values[is_le_zero] = ds.HDATES.values[is_le_zero]
-            hyears.values[np.isnan(ds.HDATES.values)] = np.nan
+                hyears_values = np.where(hdates > 0, yearList[:, np.newaxis, np.newaxis], hdates)
+            hyears = ds["HDATES"].copy(data=hyears_values.astype(np.float32))
             hyears.attrs["long_name"] = "DERIVED: actual crop harvest years"
             hyears.attrs["units"] = "year"
             ds["HYEARS"] = hyears
@@ -1004,7 +1035,19 @@ def import_ds(
             concat_dim="time",
             combine="nested",
             chunks=chunks,
+            parallel=True,
         )
+        # open_mfdataset() applies chunks to each file separately, so time chunks can't span
+        # files. Rechunk along time after combining so that, e.g., chunks={"time": -1} gives one
+        # time-contiguous chunk for operations that difference or scan along time.
+        if isinstance(chunks, dict) and "time" in chunks:
+            this_ds = this_ds.chunk({"time": chunks["time"]})
+        # Load time-invariant variables (e.g., patches1d_itype_veg and the other 1d variables used
+        # in gridding) into memory once, rather than having every later xr_flexsel() or
+        # grid_one_variable() call read them from the files again.
+        for v in this_ds.variables:
+            if "time" not in this_ds.variables[v].dims:
+                this_ds.variables[v].load()
     elif isinstance(filelist, str):
         this_ds = xr.open_dataset(filelist, chunks=chunks)
         this_ds = mfdataset_preproc(this_ds, myVars, myVegtypes, timeSlice)
@@ -1041,19 +1084,19 @@ def import_ds(
     return this_ds
 
 
-# Return a DataArray, with defined coordinates, for a given variable in a dataset.
+# Return a DataArray, with defined coordinates, for a given variable in a dataset. Data are not read into memory here, so lazily-loaded (e.g., dask) variables stay lazy until the caller asks for values (ideally after any subsetting).
 def get_thisVar_da(thisVar, this_ds):
-    # Make DataArray for this variable
-    thisvar_da = np.array(this_ds.variables[thisVar])
-    theseDims = this_ds.variables[thisVar].dims
-    thisvar_da = xr.DataArray(thisvar_da, dims=theseDims)
+    # Make DataArray for this variable, dropping any non-dimension coordinates. The deep copy
+    # means that editing the result (even in place) never changes this_ds. For in-memory data
+    # that copies the values; for lazy data it only copies the lazy array, without reading it.
+    thisvar_da = this_ds[thisVar].reset_coords(drop=True).copy(deep=True)
+    theseDims = thisvar_da.dims
 
     # Define coordinates of this variable's DataArray
     dimsDict = dict()
     for thisDim in theseDims:
         dimsDict[thisDim] = this_ds[thisDim]
     thisvar_da = thisvar_da.assign_coords(dimsDict)
-    thisvar_da.attrs = this_ds[thisVar].attrs
 
     return thisvar_da
 
@@ -1077,13 +1120,12 @@ def trim_da_to_mgd_crop(thisvar_da, patches1d_itype_veg_str):
         )
 
     # Get boolean list of whether each patch is planted with a managed crop
-    notcrop_list = ["tree", "grass", "shrub", "unmanaged", "not_vegetated"]
-    is_crop = is_each_vegtype(patches1d_itype_veg_str, notcrop_list, "notok_contains")
+    is_crop = is_each_vegtype(patches1d_itype_veg_str, NOTCROP_LIST, "notok_contains")
 
     # Warn if no managed crops were found, but still return the empty result
     if np.all(np.bitwise_not(is_crop)):
         print("No managed crops found! Returning empty DataArray.")
-    return thisvar_da.isel(patch=[i for i, x in enumerate(is_crop) if x])
+    return thisvar_da.isel(patch=np.flatnonzero(is_crop))
 
 
 # Make a geographically gridded DataArray (with dimensions time, vegetation type [as string], lat, lon) of one variable within a Dataset. Optional keyword arguments will be passed to xr_flexsel() to select single steps or slices along the specified ax(ie)s.
@@ -1093,14 +1135,15 @@ def grid_one_variable(this_ds, thisVar, fillValue=None, **kwargs):
     # Get this Dataset's values for selection(s), if provided
     this_ds = xr_flexsel(this_ds, **kwargs)
 
-    # Get DataArrays needed for gridding
+    # Get DataArray needed for gridding. The 1d vegetation type and x/y index variables are only
+    # used as index arrays, so just get their values.
     thisvar_da = get_thisVar_da(thisVar, this_ds)
-    vt_da = None
+    vt = None
     if "patch" in thisvar_da.dims:
         spatial_unit = "patch"
         xy_1d_prefix = "patches"
         if "patches1d_itype_veg" in this_ds:
-            vt_da = get_thisVar_da("patches1d_itype_veg", this_ds)
+            vt = this_ds["patches1d_itype_veg"].values
     elif "gridcell" in thisvar_da.dims:
         spatial_unit = "gridcell"
         xy_1d_prefix = "grid"
@@ -1108,17 +1151,26 @@ def grid_one_variable(this_ds, thisVar, fillValue=None, **kwargs):
         raise RuntimeError(
             f"What variables to use for _ixy and _jxy of variable with dims {thisvar_da.dims}?"
         )
-    ixy_da = get_thisVar_da(xy_1d_prefix + "1d_ixy", this_ds)
-    jxy_da = get_thisVar_da(xy_1d_prefix + "1d_jxy", this_ds)
+    ixy = this_ds[xy_1d_prefix + "1d_ixy"].values
+    jxy = this_ds[xy_1d_prefix + "1d_jxy"].values
 
     if not fillValue and "_FillValue" in thisvar_da.attrs:
         fillValue = thisvar_da.attrs["_FillValue"]
 
-    # Renumber vt_da to work as indices on new ivt dimension, if needed.
-    ### Ensures that the unique set of vt_da values begins with 1 and
+    # Renumber vt to work as indices on new ivt dimension, if needed.
+    ### Ensures that the unique set of vt values begins with 1 and
     ### contains no missing steps.
-    if "ivt" in this_ds and vt_da is not None:
-        vt_da.values = np.array([np.where(this_ds.ivt.values == x)[0][0] for x in vt_da.values])
+    ### Uses a lookup table from vegetation type to position on ivt, rather than searching
+    ### this_ds.ivt.values once per patch.
+    if "ivt" in this_ds and vt is not None:
+        ivt = this_ds.ivt.values.astype(int)
+        ivt_position = np.full(ivt.max() + 1, -1)
+        ivt_position[ivt] = np.arange(len(ivt))
+        vt = vt.astype(int)
+        is_in_range = (vt >= 0) & (vt <= ivt.max())
+        if not np.all(is_in_range) or np.any(ivt_position[vt[is_in_range]] < 0):
+            raise RuntimeError("Some patches have vegetation types not found in this_ds.ivt")
+        vt = ivt_position[vt]
 
     # Get new dimension list
     new_dims = list(thisvar_da.dims)
@@ -1140,31 +1192,29 @@ def grid_one_variable(this_ds, thisVar, fillValue=None, **kwargs):
             n = thisvar_da.sizes[dim]
         else:
             n = this_ds.sizes[dim]
-        n_list = n_list + [n]
-    thisvar_gridded = np.empty(n_list)
-    if fillValue:
-        thisvar_gridded[:] = fillValue
-    else:
-        thisvar_gridded[:] = np.NaN
+        n_list.append(n)
+    thisvar_gridded = np.full(n_list, fillValue if fillValue else np.nan, dtype=float)
 
     # Fill with this variable
     fill_indices = []
     for dim in new_dims:
         if dim == "lat":
-            fill_indices.append(jxy_da.values.astype(int) - 1)
+            fill_indices.append(jxy.astype(int) - 1)
         elif dim == "lon":
-            fill_indices.append(ixy_da.values.astype(int) - 1)
+            fill_indices.append(ixy.astype(int) - 1)
         elif dim == "ivt_str":
-            fill_indices.append(vt_da)
+            fill_indices.append(vt)
         elif not fill_indices:
             # I.e., if fill_indices is empty. Could also do "elif len(fill_indices)==0".
             fill_indices.append(Ellipsis)
+    # thisvar_da may be lazy (see get_thisVar_da()), so read its values just once
+    thisvar_values = thisvar_da.values
     try:
-        thisvar_gridded[tuple(fill_indices[: len(fill_indices)])] = thisvar_da.values
+        thisvar_gridded[tuple(fill_indices[: len(fill_indices)])] = thisvar_values
     except:
-        thisvar_gridded[tuple(fill_indices[: len(fill_indices)])] = thisvar_da.values.transpose()
+        thisvar_gridded[tuple(fill_indices[: len(fill_indices)])] = thisvar_values.transpose()
     if not np.any(np.bitwise_not(np.isnan(thisvar_gridded))):
-        if np.all(np.isnan(thisvar_da.values)):
+        if np.all(np.isnan(thisvar_values)):
             print("Warning: This DataArray (and thus map) is all NaN")
         else:
             raise RuntimeError("thisvar_gridded was not filled!")
@@ -1315,7 +1365,7 @@ def safer_timeslice(ds, timeSlice, timeVar="time"):
                 or timeSlice.stop.split("-")[1:] == ["01", "01"]
             )
         ):
-            fileyears = np.array([x.year for x in ds.time.values])
+            fileyears = ds[timeVar].dt.year.values
             if len(np.unique(fileyears)) != len(fileyears):
                 print("Could not fall back to integer slicing of years: Time axis not annual")
                 raise